@@ -1,2 +1,4 @@
 from .service import AzureSearchService, IndexExistsException
+from .validation import (ValidationIssue, DefinitionValidationError, ERROR, WARNING,
+                         load_definitions, validate_definitions)
 from .cli import cli
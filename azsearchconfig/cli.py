@@ -1,4 +1,5 @@
 import json
+import os
 import sys
 
 from collections import namedtuple
@@ -8,11 +9,15 @@ import configargparse
 from azure.common.client_factory import get_client_from_cli_profile
 from azure.common.credentials import ServicePrincipalCredentials
 
-from . import (IndexExistsException, AzureSearchService)
+from . import (IndexExistsException, AzureSearchService,
+               DefinitionValidationError, ERROR, validate_definitions)
 
 CliResult = namedtuple(
     'CliResult', ['result', 'error'])
 
+SERVICE_ARGUMENTS = ['tenantId', 'servicePrincipalId', 'servicePrincipalKey',
+                     'subscription', 'resourceGroup', 'searchServiceName']
+
 
 def get_sp_credentials(app_id: str, app_password: str, tenant: str) -> ServicePrincipalCredentials:
 
@@ -24,6 +29,32 @@ def get_sp_credentials(app_id: str, app_password: str, tenant: str) -> ServicePr
     return credentials
 
 
+def validate_definition_path(path: str) -> CliResult:
+    issues = validate_definitions(path)
+    if any(i.severity == ERROR for i in issues):
+        return CliResult(None, DefinitionValidationError(path, [i._asdict() for i in issues]))
+    # Warnings alone don't stop a deployment
+    return CliResult({'path': path, 'issues': [i._asdict() for i in issues]}, None)
+
+
+def add_validate_argument(parser):
+    parser.add_argument('--validate',
+                        action='store_true',
+                        help="Validate the definitions in the file's directory before contacting the search service")
+
+
+def create_validate_command(parser_validate):
+
+    def validate_handler(searchService, args) -> CliResult:
+        return validate_definition_path(args.path)
+
+    parser_validate.add_argument('path', nargs='?', default='indexes',
+                                 help='A definition file or a directory of index, datasource and indexer definitions')
+    parser_validate.set_defaults(func=validate_handler, offline=True)
+
+    return parser_validate
+
+
 def handle_indexer_command(searchService, args):
     if args.function == 'list':
         listing = searchService.list_indexers()
@@ -110,6 +141,7 @@ def create_index_command(parser_index):
                               help="Will force an existing index to be dropped and re-created if it can't be updated")
     create_index.add_argument('--file', required=True,
                               help='The index definition')
+    add_validate_argument(create_index)
     create_index.set_defaults(func=create_index_handler)
 
     update_index = index_cmd.add_parser('update', help='Update an index')
@@ -187,6 +219,7 @@ def create_datasource_command(parser_datasource):
     create_datasource.add_argument('--connectionString', required=True,
                                    env_var='connectionString',
                                    help='The Connection String used by the datasource')
+    add_validate_argument(create_datasource)
     create_datasource.set_defaults(func=create_datasource_handler)
 
     update_datasource = datasource_cmd.add_parser(
@@ -272,6 +305,7 @@ def create_indexer_command(parser_indexer):
                                 help="Will attempt an update if the indexer exists")
     create_indexer.add_argument('--file', required=True,
                                 help='The indexer definition')
+    add_validate_argument(create_indexer)
     create_indexer.set_defaults(func=create_indexer_handler)
 
     update_indexer = indexer_cmd.add_parser('update', help='Update an indexer')
@@ -288,36 +322,35 @@ def create_parent_parser():
     parent_parser.add('-c', '--config',
                       required=False,
                       is_config_file=True,
-                      default='.azsearchconfig',
-                      help='config file path')
+                      help='config file path (.azsearchconfig is read if it exists)')
 
     parent_parser.add_argument('--tenantId',
-                               required=True,
+                               required=False,
                                env_var='tenantId',
                                help='The tenant ID')
 
     parent_parser.add_argument('--servicePrincipalId',
-                               required=True,
+                               required=False,
                                env_var='servicePrincipalId',
                                help='The client (service principal) ID')
 
     parent_parser.add_argument('--servicePrincipalKey',
-                               required=True,
+                               required=False,
                                env_var='servicePrincipalKey',
                                help='The client (service principal) password')
 
     parent_parser.add_argument('--subscription',
-                               required=True,
+                               required=False,
                                env_var='subscription',
                                help='The subscription housing the search service')
 
     parent_parser.add_argument('--resourceGroup',
-                               required=True,
+                               required=False,
                                env_var='resourceGroup',
                                help='The resource group housing the search service')
 
     parent_parser.add_argument('--searchServiceName',
-                               required=True,
+                               required=False,
                                env_var='searchServiceName',
                                help='The name of the search service')
 
@@ -329,6 +362,7 @@ def create_parser():
     parser = configargparse.ArgumentParser(
         description='Configure an Azure Search index.',
         parents=[create_parent_parser()],
+        default_config_files=['.azsearchconfig'],
         formatter_class=configargparse.ArgumentDefaultsHelpFormatter
     )
 
@@ -347,13 +381,17 @@ def create_parser():
     create_indexer_command(subparsers.add_parser(
         'indexer', help='Indexer configuration'))
 
+    create_validate_command(subparsers.add_parser(
+        'validate', help='Validate definitions without contacting the search service'))
+
     return parser
 
 
-def cli():
-    parser = create_parser()
-
-    args = parser.parse_args()
+def create_search_service(parser, args) -> AzureSearchService:
+    missing = [a for a in SERVICE_ARGUMENTS if not getattr(args, a)]
+    if missing:
+        parser.error(
+            f"the following arguments are required: {', '.join('--' + a for a in missing)}")
 
     credentials = get_sp_credentials(
         tenant=args.tenantId,
@@ -361,14 +399,32 @@ def cli():
         app_password=args.servicePrincipalKey
     )
 
-    searchService = AzureSearchService(
+    return AzureSearchService(
         credentials=credentials,
         subscription=args.subscription,
         resource_group=args.resourceGroup,
         search_service_name=args.searchServiceName
     )
 
-    result, err = args.func(searchService, args)
+
+def cli():
+    parser = create_parser()
+
+    args = parser.parse_args()
+
+    # Check the definitions before anything is sent to the search service
+    err = None
+    if getattr(args, 'validate', False):
+        validation, err = validate_definition_path(os.path.dirname(args.file) or '.')
+        if validation and validation['issues']:
+            print(json.dumps(validation), file=sys.stderr)
+
+    if not err:
+        searchService = None
+        if not getattr(args, 'offline', False):
+            searchService = create_search_service(parser, args)
+
+        result, err = args.func(searchService, args)
 
     if err:
         print(json.dumps(err._asdict()), file=sys.stderr)
@@ -0,0 +1,508 @@
+import json
+import os
+import re
+from collections import namedtuple
+from typing import List, Tuple
+
+
+Definition = namedtuple('Definition', ['path', 'kind', 'body'])
+
+ERROR = 'error'
+WARNING = 'warning'
+
+ValidationIssue = namedtuple(
+    'ValidationIssue', ['path', 'message', 'severity'], defaults=[ERROR])
+
+DefinitionValidationError = namedtuple(
+    'DefinitionValidationError', ['path', 'issues'])
+
+
+INDEX = 'index'
+DATASOURCE = 'datasource'
+INDEXER = 'indexer'
+
+RESOURCE_NAME_PATTERN = re.compile(r'^[a-z0-9](?:[a-z0-9-]{0,126}[a-z0-9])?$')
+FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z][A-Za-z0-9_]{0,127}$')
+
+PRIMITIVE_TYPES = {
+    'Edm.String',
+    'Edm.Int32',
+    'Edm.Int64',
+    'Edm.Double',
+    'Edm.Boolean',
+    'Edm.DateTimeOffset',
+    'Edm.GeographyPoint'
+}
+COMPLEX_TYPE = 'Edm.ComplexType'
+STRING_TYPES = {'Edm.String', 'Collection(Edm.String)'}
+NUMERIC_TYPES = {'Edm.Int32', 'Edm.Int64', 'Edm.Double'}
+GEOGRAPHY_TYPES = {'Edm.GeographyPoint', 'Collection(Edm.GeographyPoint)'}
+
+# Unknown datasource types and mapping functions are only warned about as
+# the service may support ones added after these lists were written
+DATASOURCE_TYPES = {
+    'azureblob',
+    'adlsgen2',
+    'azurefile',
+    'azuresql',
+    'azuretable',
+    'cosmosdb',
+    'mysql',
+    'onelake',
+    'sharepoint'
+}
+
+# The field types each scoring function can be applied to
+SCORING_FUNCTION_TYPES = {
+    'distance': {'Edm.GeographyPoint'},
+    'freshness': {'Edm.DateTimeOffset'},
+    'magnitude': NUMERIC_TYPES,
+    'tag': STRING_TYPES
+}
+
+# The field types each mapping function can write to, along with the parameters it requires
+MAPPING_FUNCTIONS = {
+    'base64Encode': ({'Edm.String'}, []),
+    'base64Decode': ({'Edm.String'}, []),
+    'urlEncode': ({'Edm.String'}, []),
+    'urlDecode': ({'Edm.String'}, []),
+    'extractTokenAtPosition': ({'Edm.String'}, ['delimiter', 'position']),
+    'fixedLengthEncode': ({'Edm.String'}, []),
+    'jsonArrayToStringCollection': ({'Collection(Edm.String)'}, []),
+    'toJson': ({'Edm.String'}, [])
+}
+
+
+def _is_collection(field_type: str) -> bool:
+    return field_type.startswith('Collection(') and field_type.endswith(')')
+
+
+def _element_type(field_type: str) -> str:
+    return field_type[len('Collection('):-1] if _is_collection(field_type) else field_type
+
+
+def _classify(body: dict) -> str:
+    if 'fields' in body:
+        return INDEX
+    if 'dataSourceName' in body or 'targetIndexName' in body:
+        return INDEXER
+    if 'container' in body or 'credentials' in body:
+        return DATASOURCE
+    return None
+
+
+def load_definitions(path: str) -> Tuple[List[Definition], List[ValidationIssue]]:
+    """Loads all of the index, datasource and indexer definitions under path.
+
+    path may be a single definition file or a directory that is searched
+    recursively for .json files.
+    """
+    if os.path.isfile(path):
+        files = [path]
+    elif os.path.isdir(path):
+        files = sorted(os.path.join(root, name)
+                       for root, _, names in os.walk(path)
+                       for name in names if name.endswith('.json'))
+    else:
+        return [], [ValidationIssue(path, 'No such file or directory')]
+
+    definitions = []
+    issues = []
+
+    for file in files:
+        try:
+            with open(file, 'r') as f:
+                body = json.load(f)
+        except ValueError as e:
+            issues.append(ValidationIssue(file, f'Invalid JSON: {e}'))
+            continue
+
+        kind = _classify(body) if isinstance(body, dict) else None
+        if not kind:
+            issues.append(ValidationIssue(
+                file, 'Not recognised as an index, datasource or indexer definition'))
+            continue
+
+        definitions.append(Definition(file, kind, body))
+
+    return definitions, issues
+
+
+def _objects(value, description: str) -> Tuple[List[dict], List[str]]:
+    """Splits a definition list into its object entries and messages for anything else."""
+    if value is None:
+        return [], []
+    if not isinstance(value, list):
+        return [], [f'{description} entries must be a list']
+
+    objects = []
+    messages = []
+    for position, entry in enumerate(value):
+        if isinstance(entry, dict):
+            objects.append(entry)
+        else:
+            messages.append(f'{description} entry {position} is not an object')
+    return objects, messages
+
+
+def _lookup(resources: dict, name):
+    return resources.get(name) if isinstance(name, str) else None
+
+
+def _check_resource_name(definition: Definition) -> List[str]:
+    name = definition.body.get('name')
+    if not name:
+        return [f'The {definition.kind} has no name']
+    if not isinstance(name, str) or not RESOURCE_NAME_PATTERN.match(name):
+        return [f"'{name}' is not a valid {definition.kind} name - use lowercase letters, digits or dashes, "
+                "starting and ending with a letter or digit"]
+    return []
+
+
+def _field_type(field: dict) -> str:
+    field_type = field.get('type')
+    return field_type if isinstance(field_type, str) else ''
+
+
+def _flatten_fields(fields, prefix: str = '') -> dict:
+    flattened = {}
+    for field in _objects(fields, 'Field')[0]:
+        name = field.get('name')
+        if not isinstance(name, str):
+            continue
+        flattened[prefix + name] = field
+        if _element_type(_field_type(field)) == COMPLEX_TYPE:
+            flattened.update(_flatten_fields(
+                field.get('fields'), f'{prefix}{name}/'))
+    return flattened
+
+
+def _check_fields(fields, prefix: str = '') -> List[str]:
+    objects, messages = _objects(
+        fields, f"Field '{prefix[:-1]}' sub-field" if prefix else 'Field')
+    seen = set()
+
+    for field in objects:
+        name = field.get('name')
+        field_type = _field_type(field)
+
+        if not name:
+            messages.append(f'A field under "{prefix or "/"}" has no name')
+            continue
+
+        path = f'{prefix}{name}'
+
+        if not isinstance(name, str) or not FIELD_NAME_PATTERN.match(name) or name.startswith('azureSearch'):
+            messages.append(f"Field '{path}' has an invalid name")
+        elif name in seen:
+            messages.append(f"Field '{path}' is defined more than once")
+        else:
+            seen.add(name)
+
+        element_type = _element_type(field_type)
+        if element_type != COMPLEX_TYPE and element_type not in PRIMITIVE_TYPES:
+            messages.append(
+                f"Field '{path}' has an unknown type '{field.get('type')}'")
+            continue
+
+        if element_type == COMPLEX_TYPE:
+            attributes = [a for a in ('key', 'searchable', 'filterable', 'sortable', 'facetable', 'retrievable')
+                          if a in field]
+            if attributes:
+                messages.append(
+                    f"Complex field '{path}' cannot set {', '.join(attributes)}")
+            if not field.get('fields'):
+                messages.append(f"Complex field '{path}' has no sub-fields")
+            messages.extend(_check_fields(field.get('fields'), path + '/'))
+            continue
+
+        if field.get('key'):
+            if prefix:
+                messages.append(f"Field '{path}' is a sub-field and cannot be the key")
+            if field_type != 'Edm.String':
+                messages.append(
+                    f"Key field '{path}' must be Edm.String, not {field_type}")
+            if field.get('retrievable') is False:
+                messages.append(f"Key field '{path}' must be retrievable")
+
+        if field.get('searchable') and field_type not in STRING_TYPES:
+            messages.append(
+                f"Field '{path}' is {field_type} and cannot be searchable")
+        if field.get('sortable') and _is_collection(field_type):
+            messages.append(
+                f"Field '{path}' is a collection and cannot be sortable")
+        if field.get('facetable') and field_type in GEOGRAPHY_TYPES:
+            messages.append(
+                f"Field '{path}' is {field_type} and cannot be facetable")
+
+        analyzers = [a for a in ('analyzer', 'searchAnalyzer', 'indexAnalyzer')
+                     if field.get(a)]
+        if analyzers and not field.get('searchable'):
+            messages.append(
+                f"Field '{path}' sets {', '.join(analyzers)} but is not searchable")
+
+    return messages
+
+
+def validate_index(definition: Definition) -> List[ValidationIssue]:
+    """Checks an index definition in isolation."""
+    body = definition.body
+    messages = _check_resource_name(definition)
+
+    fields = body.get('fields')
+    if not fields:
+        messages.append('The index has no fields')
+
+    messages.extend(_check_fields(fields))
+
+    keys = [f.get('name') for f in _objects(fields, 'Field')[0] if f.get('key')]
+    if fields and len(keys) != 1:
+        messages.append(
+            f"The index must have exactly one key field, found {len(keys)}")
+
+    all_fields = _flatten_fields(fields)
+
+    suggesters, suggester_messages = _objects(body.get('suggesters'), 'Suggester')
+    messages.extend(suggester_messages)
+    for suggester in suggesters:
+        suggester_name = suggester.get('name')
+        source_fields = suggester.get('sourceFields') or []
+        if not isinstance(source_fields, list):
+            messages.append(
+                f"Suggester '{suggester_name}' sourceFields is not a list")
+            continue
+        for source in source_fields:
+            field = _lookup(all_fields, source)
+            if not field:
+                messages.append(
+                    f"Suggester '{suggester_name}' refers to unknown field '{source}'")
+            elif _field_type(field) not in STRING_TYPES or not field.get('searchable'):
+                messages.append(
+                    f"Suggester '{suggester_name}' source field '{source}' must be a searchable string")
+
+    profile_names = set()
+    profiles, profile_messages = _objects(
+        body.get('scoringProfiles'), 'Scoring profile')
+    messages.extend(profile_messages)
+    for profile in profiles:
+        profile_name = profile.get('name')
+        if not isinstance(profile_name, str):
+            messages.append(f"Scoring profile '{profile_name}' has an invalid name")
+        elif profile_name in profile_names:
+            messages.append(
+                f"Scoring profile '{profile_name}' is defined more than once")
+        else:
+            profile_names.add(profile_name)
+
+        text = profile.get('text') or {}
+        weights = (text.get('weights') if isinstance(text, dict) else None) or {}
+        if not isinstance(weights, dict):
+            messages.append(
+                f"Scoring profile '{profile_name}' text weights is not an object")
+            weights = {}
+        for weighted in weights:
+            field = all_fields.get(weighted)
+            if not field:
+                messages.append(
+                    f"Scoring profile '{profile_name}' weights unknown field '{weighted}'")
+            elif not field.get('searchable'):
+                messages.append(
+                    f"Scoring profile '{profile_name}' weights field '{weighted}' which is not searchable")
+
+        functions, function_messages = _objects(
+            profile.get('functions'), f"Scoring profile '{profile_name}' function")
+        messages.extend(function_messages)
+        for function in functions:
+            function_type = function.get('type')
+            field_name = function.get('fieldName')
+            field = _lookup(all_fields, field_name)
+            if _lookup(SCORING_FUNCTION_TYPES, function_type) is None:
+                messages.append(
+                    f"Scoring profile '{profile_name}' has an unknown function type '{function_type}'")
+            elif not field:
+                messages.append(
+                    f"Scoring profile '{profile_name}' {function_type} function refers to unknown field '{field_name}'")
+            elif _field_type(field) not in SCORING_FUNCTION_TYPES[function_type]:
+                messages.append(
+                    f"Scoring profile '{profile_name}' {function_type} function cannot use "
+                    f"field '{field_name}' of type {field.get('type')}")
+            elif not field.get('filterable'):
+                messages.append(
+                    f"Scoring profile '{profile_name}' {function_type} function field '{field_name}' must be filterable")
+
+    default_profile = body.get('defaultScoringProfile')
+    if default_profile and (not isinstance(default_profile, str) or default_profile not in profile_names):
+        messages.append(
+            f"The default scoring profile '{default_profile}' is not defined")
+
+    return [ValidationIssue(definition.path, m) for m in messages]
+
+
+def validate_datasource(definition: Definition) -> List[ValidationIssue]:
+    """Checks a datasource definition in isolation."""
+    body = definition.body
+    messages = _check_resource_name(definition)
+    warnings = []
+
+    datasource_type = body.get('type')
+    if not datasource_type or not isinstance(datasource_type, str):
+        messages.append('The datasource has no type')
+    elif datasource_type not in DATASOURCE_TYPES:
+        warnings.append(
+            f"Unknown datasource type '{datasource_type}' - expected one of {', '.join(sorted(DATASOURCE_TYPES))}")
+
+    container = body.get('container')
+    if not isinstance(container, dict):
+        messages.append('The datasource container is not an object')
+    elif not container.get('name'):
+        messages.append('The datasource has no container name')
+
+    return ([ValidationIssue(definition.path, m) for m in messages] +
+            [ValidationIssue(definition.path, m, WARNING) for m in warnings])
+
+
+def validate_indexer(definition: Definition, indexes: dict, datasources: dict) -> List[ValidationIssue]:
+    """Checks an indexer definition against the indexes and datasources it refers to.
+
+    indexes and datasources map resource names to their definitions.
+    """
+    body = definition.body
+    messages = _check_resource_name(definition)
+    warnings = []
+
+    datasource_name = body.get('dataSourceName')
+    datasource = _lookup(datasources, datasource_name)
+    if not datasource:
+        messages.append(
+            f"The datasource '{datasource_name}' is not defined")
+
+    index_name = body.get('targetIndexName')
+    index = _lookup(indexes, index_name)
+    if not index:
+        messages.append(f"The target index '{index_name}' is not defined")
+
+    parameters = body.get('parameters') or {}
+    configuration = (parameters.get('configuration') if isinstance(parameters, dict) else None) or {}
+    if not isinstance(parameters, dict):
+        messages.append('The indexer parameters value is not an object')
+    elif not isinstance(configuration, dict):
+        messages.append('The indexer parameters configuration is not an object')
+    elif 'parsingMode' in configuration and datasource and datasource.body.get('type') not in ('azureblob', 'adlsgen2'):
+        messages.append(
+            f"parsingMode is only supported for blob datasources, not '{datasource.body.get('type')}'")
+
+    index_fields = _flatten_fields(index.body.get('fields')) if index else {}
+
+    for mapping_key in ('fieldMappings', 'outputFieldMappings'):
+        targets = set()
+        mappings, mapping_messages = _objects(body.get(mapping_key), mapping_key)
+        messages.extend(mapping_messages)
+        for mapping in mappings:
+            source = mapping.get('sourceFieldName')
+            target = mapping.get('targetFieldName') or source
+
+            if not source:
+                messages.append(f'A {mapping_key} entry has no sourceFieldName')
+                continue
+
+            if not isinstance(source, str) or not isinstance(target, str):
+                messages.append(
+                    f"A {mapping_key} entry has a field name that is not a string")
+                continue
+
+            if target in targets:
+                messages.append(
+                    f"More than one {mapping_key} entry targets field '{target}'")
+            targets.add(target)
+
+            field = index_fields.get(target)
+            if index and not field:
+                messages.append(
+                    f"Mapping '{source}' targets field '{target}' which is not in index '{index_name}'")
+
+            function = mapping.get('mappingFunction')
+            if not function:
+                continue
+
+            if not isinstance(function, dict):
+                messages.append(
+                    f"Mapping '{source}' mappingFunction is not an object - use {{\"name\": \"{function}\"}}")
+                continue
+
+            function_name = function.get('name')
+            if not function_name or not isinstance(function_name, str):
+                messages.append(
+                    f"Mapping '{source}' mappingFunction has no name")
+                continue
+            if function_name not in MAPPING_FUNCTIONS:
+                warnings.append(
+                    f"Mapping '{source}' uses an unknown mapping function '{function_name}'")
+                continue
+
+            output_types, required_parameters = MAPPING_FUNCTIONS[function_name]
+            parameters = function.get('parameters') or {}
+            for parameter in required_parameters:
+                if not isinstance(parameters, dict) or parameter not in parameters:
+                    messages.append(
+                        f"Mapping '{source}' function {function_name} requires the '{parameter}' parameter")
+            if field and _field_type(field) not in output_types:
+                messages.append(
+                    f"Mapping '{source}' function {function_name} produces {', '.join(sorted(output_types))} "
+                    f"but field '{target}' is {field.get('type')}")
+
+    return ([ValidationIssue(definition.path, m) for m in messages] +
+            [ValidationIssue(definition.path, m, WARNING) for m in warnings])
+
+
+def validate_definition_set(definitions: List[Definition]) -> List[ValidationIssue]:
+    """Checks each definition and the references between them."""
+    issues = []
+    resources = {INDEX: {}, DATASOURCE: {}, INDEXER: {}}
+
+    for definition in definitions:
+        name = definition.body.get('name')
+        if not isinstance(name, str):
+            # Reported by the name check for the definition's kind
+            continue
+        existing = resources[definition.kind].get(name)
+        if existing:
+            issues.append(ValidationIssue(
+                definition.path, f"The {definition.kind} '{name}' is also defined in {existing.path}"))
+        else:
+            resources[definition.kind][name] = definition
+
+    for definition in definitions:
+        if definition.kind == INDEX:
+            issues.extend(validate_index(definition))
+        elif definition.kind == DATASOURCE:
+            issues.extend(validate_datasource(definition))
+        else:
+            issues.extend(validate_indexer(
+                definition, resources[INDEX], resources[DATASOURCE]))
+
+    return issues
+
+
+def validate_definitions(path: str) -> List[ValidationIssue]:
+    """Loads the definitions under path and returns any problems found.
+
+    When path is a single file the other definitions in its directory are
+    loaded so that its references can be resolved, but only the issues for
+    that file are returned.
+
+    Issues with a WARNING severity, such as an unrecognised mapping function,
+    may still be accepted by the service so shouldn't stop a deployment.
+
+    No calls are made to the search service so this is safe to run before
+    any changes are deployed.
+    """
+    definitions, issues = load_definitions(path)
+
+    if not os.path.isfile(path):
+        return issues + validate_definition_set(definitions)
+
+    siblings, _ = load_definitions(os.path.dirname(path) or '.')
+    others = [d for d in siblings if not os.path.samefile(d.path, path)]
+    # Load the file last so a name it shares with a sibling is reported against it
+    return issues + [i for i in validate_definition_set(others + definitions)
+                     if i.path == path]
@@ -8,6 +8,8 @@ export connectionString="DefaultEndpointsProtocol=https;AccountName=${datalakeAc
 
 touch .azsearchconfig
 
+pipenv run ./configure_search validate indexes
+
 pipenv run ./configure_search index create \
     --file indexes/postcodes/postcodes-index.json \
     --update --force
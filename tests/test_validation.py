@@ -0,0 +1,178 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+
+from azsearchconfig.validation import ERROR, WARNING, validate_definitions
+
+INDEXES_DIR = os.path.join(os.path.dirname(__file__), '..', 'indexes')
+
+INDEX = {
+    'name': 'stations',
+    'fields': [
+        {'name': 'id', 'type': 'Edm.String', 'key': True, 'searchable': True},
+        {'name': 'name', 'type': 'Edm.String', 'searchable': True},
+        {'name': 'start_year', 'type': 'Edm.Int32', 'filterable': True},
+        {'name': 'location', 'type': 'Edm.GeographyPoint', 'filterable': True}
+    ],
+    'suggesters': [
+        {'name': 'station_name', 'searchMode': 'analyzingInfixMatching', 'sourceFields': ['name']}
+    ],
+    'scoringProfiles': [
+        {
+            'name': 'geo',
+            'text': {'weights': {'name': 5}},
+            'functions': [{'type': 'distance', 'fieldName': 'location', 'boost': 5}]
+        }
+    ]
+}
+
+DATASOURCE = {
+    'name': 'stations-table-datasource',
+    'type': 'azuretable',
+    'container': {'name': 'WeatherStations'}
+}
+
+INDEXER = {
+    'name': 'stations-table-indexer',
+    'dataSourceName': 'stations-table-datasource',
+    'targetIndexName': 'stations',
+    'fieldMappings': [
+        {
+            'sourceFieldName': 'Key',
+            'targetFieldName': 'id',
+            'mappingFunction': {'name': 'base64Encode'}
+        },
+        {'sourceFieldName': 'name', 'targetFieldName': 'name'}
+    ]
+}
+
+
+class ValidateDefinitionsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.index = copy.deepcopy(INDEX)
+        self.datasource = copy.deepcopy(DATASOURCE)
+        self.indexer = copy.deepcopy(INDEXER)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write_definitions(self):
+        for name, body in (('index', self.index),
+                           ('datasource', self.datasource),
+                           ('indexer', self.indexer)):
+            with open(os.path.join(self.tempdir.name, f'{name}.json'), 'w') as f:
+                json.dump(body, f)
+
+    def validate(self, severity=ERROR):
+        self.write_definitions()
+        return [i.message for i in validate_definitions(self.tempdir.name)
+                if i.severity == severity]
+
+    def assertIssue(self, fragment, severity=ERROR):
+        messages = self.validate(severity)
+        self.assertTrue(any(fragment in m for m in messages),
+                        f'{fragment!r} not found in {messages}')
+
+    def test_repository_indexes_are_valid(self):
+        self.assertEqual(validate_definitions(INDEXES_DIR), [])
+
+    def test_valid_definitions(self):
+        self.assertEqual(self.validate(), [])
+
+    def test_unknown_target_field(self):
+        self.indexer['fieldMappings'][1]['targetFieldName'] = 'nmae'
+        self.assertIssue("targets field 'nmae' which is not in index 'stations'")
+
+    def test_unknown_datasource(self):
+        self.indexer['dataSourceName'] = 'stations-datasource'
+        self.assertIssue("The datasource 'stations-datasource' is not defined")
+
+    def test_mapping_function_output_type(self):
+        self.indexer['fieldMappings'][0]['targetFieldName'] = 'start_year'
+        self.assertIssue(
+            "function base64Encode produces Edm.String but field 'start_year' is Edm.Int32")
+
+    def test_searchable_number(self):
+        self.index['fields'][2]['searchable'] = True
+        self.assertIssue("Field 'start_year' is Edm.Int32 and cannot be searchable")
+
+    def test_no_fields(self):
+        self.index['fields'] = None
+        messages = self.validate()
+        self.assertIn('The index has no fields', messages)
+        self.assertFalse(any('key field' in m for m in messages), messages)
+
+    def test_unknown_mapping_function_is_a_warning(self):
+        self.indexer['fieldMappings'][0]['mappingFunction'] = {'name': 'someNewFunction'}
+        self.assertEqual(self.validate(), [])
+        self.assertIssue("unknown mapping function 'someNewFunction'", WARNING)
+
+    def test_unknown_datasource_type_is_a_warning(self):
+        self.datasource['type'] = 'somenewsource'
+        self.assertEqual(self.validate(), [])
+        self.assertIssue("Unknown datasource type 'somenewsource'", WARNING)
+
+    def test_name_ending_in_dash(self):
+        self.indexer['name'] = 'stations-'
+        self.assertIssue("'stations-' is not a valid indexer name")
+
+    def test_parameters_not_an_object(self):
+        self.indexer['parameters'] = [1]
+        self.assertIssue('The indexer parameters value is not an object')
+
+    def test_null_collections(self):
+        self.index['suggesters'] = None
+        self.index['scoringProfiles'][0]['text']['weights'] = None
+        self.index['scoringProfiles'][0]['functions'] = None
+        self.assertEqual(self.validate(), [])
+
+        self.index['scoringProfiles'] = None
+        self.assertEqual(self.validate(), [])
+
+    def test_field_not_an_object(self):
+        self.index['fields'].append('start_year')
+        self.assertIssue('Field entry 4 is not an object')
+
+    def test_container_not_an_object(self):
+        self.datasource['container'] = 'WeatherStations'
+        self.assertIssue('The datasource container is not an object')
+
+    def test_mapping_function_not_an_object(self):
+        self.indexer['fieldMappings'][0]['mappingFunction'] = 'base64Encode'
+        self.assertIssue("Mapping 'Key' mappingFunction is not an object")
+
+    def test_name_not_a_string(self):
+        self.index['name'] = ['stations']
+        self.assertIssue("is not a valid index name")
+
+    def test_single_file_resolves_siblings(self):
+        self.write_definitions()
+        indexer_file = os.path.join(self.tempdir.name, 'indexer.json')
+        self.assertEqual(validate_definitions(indexer_file), [])
+
+        self.index['fields'][2]['searchable'] = True
+        self.indexer['fieldMappings'][1]['targetFieldName'] = 'nmae'
+        self.write_definitions()
+        issues = validate_definitions(indexer_file)
+        self.assertEqual([i.path for i in issues], [indexer_file])
+
+    def test_single_file_reports_duplicate_names(self):
+        duplicate = dict(self.index, name='stations')
+        self.write_definitions()
+        for name in ('a.json', 'b.json'):
+            with open(os.path.join(self.tempdir.name, name), 'w') as f:
+                json.dump(duplicate, f)
+
+        for name in ('a.json', 'b.json', 'index.json'):
+            path = os.path.join(self.tempdir.name, name)
+            messages = [i.message for i in validate_definitions(path)]
+            self.assertTrue(any("The index 'stations' is also defined in" in m for m in messages),
+                            f'No duplicate reported for {name}: {messages}')
+
+
+if __name__ == '__main__':
+    unittest.main()